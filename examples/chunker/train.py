@@ -20,19 +20,12 @@ import argparse
 import pickle
 from os import path
 
-from tensorflow import keras
-
-from nlp_architect.nn.tensorflow.python.keras.callbacks import ConllCallback
-from nlp_architect.data.sequential_tagging import CONLL2000
-from nlp_architect.models.chunker import SequenceChunker
-from nlp_architect.utils.embedding import load_word_embeddings, get_embedding_matrix
 from nlp_architect.utils.io import (
     validate_existing_filepath,
     validate_parent_exists,
     validate,
     validate_existing_directory,
 )
-from nlp_architect.utils.metrics import get_conll_scores
 
 
 def create_argument_parser():
@@ -47,6 +40,13 @@ def create_argument_parser():
         type=validate_existing_filepath,
         help="Word embedding model path (GloVe/Fasttext/textual)",
     )
+    _parser.add_argument(
+        "--embedding_mmap",
+        default=False,
+        action="store_true",
+        help="memory-map the word embedding vectors (a binary copy is cached next to "
+        "the embedding file on first use)",
+    )
     _parser.add_argument("--sentence_length", default=50, type=int, help="Maximum sentence length")
     _parser.add_argument(
         "--char_features",
@@ -96,7 +96,8 @@ def _save_model():
     if args.char_features is True:
         model_params.update({"char_vocab": dataset.char_vocab})
     with open(settings_path, "wb") as fp:
-        pickle.dump(model_params, fp)
+        # protocol 4 is the highest one python 3.6/3.7 can still load
+        pickle.dump(model_params, fp, protocol=4)
     model.save(model_path)
 
 
@@ -108,14 +109,21 @@ if __name__ == "__main__":
     validate((args.feature_size, int, 1, 10000))
     validate((args.b, int, 1, 100000))
     validate((args.e, int, 1, 100000))
-    model_path = path.join(
-        path.dirname(path.realpath(__file__)), "{}.h5".format(str(args.model_name))
-    )
-    settings_path = path.join(
-        path.dirname(path.realpath(__file__)), "{}.params".format(str(args.model_name))
-    )
+    base_dir = path.dirname(path.realpath(__file__))
+    model_path = path.join(base_dir, "{}.h5".format(str(args.model_name)))
+    settings_path = path.join(base_dir, "{}.params".format(str(args.model_name)))
     validate_parent_exists(model_path)
 
+    # import the tensorflow stack only once the arguments are known to be valid
+    # pylint: disable=import-outside-toplevel
+    from tensorflow import keras
+
+    from nlp_architect.nn.tensorflow.python.keras.callbacks import ConllCallback
+    from nlp_architect.data.sequential_tagging import CONLL2000
+    from nlp_architect.models.chunker import SequenceChunker
+    from nlp_architect.utils.embedding import load_word_embeddings, get_embedding_matrix
+    from nlp_architect.utils.metrics import get_conll_scores
+
     # load dataset and get tokens/chunks/pos tags
     dataset = CONLL2000(
         data_path=args.data_dir,
@@ -157,7 +165,7 @@ if __name__ == "__main__":
 
     # initialize word embedding if external model selected
     if args.embedding_model is not None:
-        embedding_model, _ = load_word_embeddings(args.embedding_model)
+        embedding_model, _ = load_word_embeddings(args.embedding_model, mmap=args.embedding_mmap)
         embedding_mat = get_embedding_matrix(embedding_model, dataset.word_vocab)
         model.load_embedding_weights(embedding_mat)
 
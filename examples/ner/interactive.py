@@ -17,13 +17,12 @@
 from __future__ import division, print_function, unicode_literals, absolute_import
 
 import argparse
-import pickle
 
 import numpy as np
 
 from nlp_architect.models.ner_crf import NERCRF
 from nlp_architect.utils.generic import pad_sentences
-from nlp_architect.utils.io import validate_existing_filepath
+from nlp_architect.utils.io import load_vocabs, validate_existing_filepath
 from nlp_architect.utils.text import SpacyInstance
 
 nlp = SpacyInstance(disable=["tagger", "ner", "parser", "vectors", "textcat"])
@@ -75,8 +74,7 @@ def vectorize(doc, w_vocab, c_vocab):
 
 if __name__ == "__main__":
     args = read_input_args()
-    with open(args.model_info_path, "rb") as fp:
-        model_info = pickle.load(fp)
+    model_info = load_vocabs(args.model_info_path)
     assert model_info is not None, "No model topology information loaded"
     model = load_saved_model()
     word_vocab = model_info["word_vocab"]
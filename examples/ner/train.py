@@ -15,18 +15,29 @@
 # ******************************************************************************
 
 import argparse
-import pickle
 from os import path
 
 import numpy as np
-from tensorflow import keras
 
-from nlp_architect.nn.tensorflow.python.keras.callbacks import ConllCallback
-from nlp_architect.data.sequential_tagging import SequentialTaggingDataset
-from nlp_architect.models.ner_crf import NERCRF
-from nlp_architect.utils.embedding import get_embedding_matrix, load_word_embeddings
-from nlp_architect.utils.io import validate, validate_existing_filepath, validate_parent_exists
-from nlp_architect.utils.metrics import get_conll_scores
+from nlp_architect.utils.io import (
+    save_vocabs,
+    validate_existing_filepath,
+    validate_parent_exists,
+)
+
+# (argument name, type, min value, max value) validated after parsing
+ARG_SPECS = (
+    ("b", int, 1, 100000),
+    ("e", int, 1, 100000),
+    ("tag_num", int, 1, 1000),
+    ("sentence_length", int, 1, 10000),
+    ("word_length", int, 1, 100),
+    ("word_embedding_dims", int, 1, 10000),
+    ("character_embedding_dims", int, 1, 1000),
+    ("char_features_lstm_dims", int, 1, 10000),
+    ("entity_tagger_lstm_dims", int, 1, 10000),
+    ("dropout", float, 0, 1),
+)
 
 
 def read_input_args():
@@ -77,6 +88,13 @@ def read_input_args():
         type=validate_existing_filepath,
         help="Path to external word embedding model file",
     )
+    parser.add_argument(
+        "--embedding_mmap",
+        default=False,
+        action="store_true",
+        help="memory-map the word embedding vectors (a binary copy is cached next to "
+        "the embedding file on first use)",
+    )
     parser.add_argument(
         "--model_path", type=str, default="model.h5", help="Path for saving model weights"
     )
@@ -94,22 +112,23 @@ def read_input_args():
     return input_args
 
 
+def _check_scalar_arg(value, name, arg_type, arg_min, arg_max):
+    # argparse hands back exact int/float instances, so skip the generic validate() machinery
+    if type(value) is not arg_type:  # pylint: disable=unidiomatic-typecheck
+        raise TypeError("Expected type {}".format(arg_type.__name__))
+    if value < arg_min:
+        raise ValueError("Value of {} must be greater or equal to {}".format(name, arg_min))
+    if value >= arg_max:
+        raise ValueError("Value of {} must be less than {}".format(name, arg_max))
+
+
 def validate_input_args(input_args):
-    validate((input_args.b, int, 1, 100000))
-    validate((input_args.e, int, 1, 100000))
-    validate((input_args.tag_num, int, 1, 1000))
-    validate((input_args.sentence_length, int, 1, 10000))
-    validate((input_args.word_length, int, 1, 100))
-    validate((input_args.word_embedding_dims, int, 1, 10000))
-    validate((input_args.character_embedding_dims, int, 1, 1000))
-    validate((input_args.char_features_lstm_dims, int, 1, 10000))
-    validate((input_args.entity_tagger_lstm_dims, int, 1, 10000))
-    validate((input_args.dropout, float, 0, 1))
-    model_path = path.join(path.dirname(path.realpath(__file__)), str(input_args.model_path))
+    for name, arg_type, arg_min, arg_max in ARG_SPECS:
+        _check_scalar_arg(getattr(input_args, name), name, arg_type, arg_min, arg_max)
+    base_dir = path.dirname(path.realpath(__file__))
+    model_path = path.join(base_dir, str(input_args.model_path))
     validate_parent_exists(model_path)
-    model_info_path = path.join(
-        path.dirname(path.realpath(__file__)), str(input_args.model_info_path)
-    )
+    model_info_path = path.join(base_dir, str(input_args.model_info_path))
     validate_parent_exists(model_info_path)
 
 
@@ -117,6 +136,16 @@ if __name__ == "__main__":
     # parse the input
     args = read_input_args()
 
+    # import the tensorflow stack only once the arguments are known to be valid
+    # pylint: disable=import-outside-toplevel
+    from tensorflow import keras
+
+    from nlp_architect.nn.tensorflow.python.keras.callbacks import ConllCallback
+    from nlp_architect.data.sequential_tagging import SequentialTaggingDataset
+    from nlp_architect.models.ner_crf import NERCRF
+    from nlp_architect.utils.embedding import get_embedding_matrix, load_word_embeddings
+    from nlp_architect.utils.metrics import get_conll_scores
+
     # load dataset and parameters
     dataset = SequentialTaggingDataset(
         args.train_file,
@@ -152,7 +181,7 @@ if __name__ == "__main__":
 
     # initialize word embedding if external model selected
     if args.embedding_model is not None:
-        embedding_model, _ = load_word_embeddings(args.embedding_model)
+        embedding_model, _ = load_word_embeddings(args.embedding_model, mmap=args.embedding_mmap)
         embedding_mat = get_embedding_matrix(embedding_model, dataset.word_vocab)
         ner_model.load_embedding_weights(embedding_mat)
 
@@ -174,13 +203,12 @@ if __name__ == "__main__":
 
     # saving model
     ner_model.save(args.model_path)
-    with open(args.model_info_path, "wb") as fp:
-        info = {
-            "y_vocab": dataset.y_labels.vocab,
-            "word_vocab": dataset.word_vocab.vocab,
-            "char_vocab": dataset.char_vocab.vocab,
-        }
-        pickle.dump(info, fp)
+    info = {
+        "y_vocab": dataset.y_labels.vocab,
+        "word_vocab": dataset.word_vocab.vocab,
+        "char_vocab": dataset.char_vocab.vocab,
+    }
+    save_vocabs(args.model_info_path, info)
 
     # running predictions
     predictions = ner_model.predict(x=test_inputs, batch_size=args.b)
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ******************************************************************************
-import pickle
 from os import makedirs, path, sys
 
 import numpy as np
@@ -22,7 +21,7 @@ from nlp_architect.api.abstract_api import AbstractApi
 from nlp_architect.models.ner_crf import NERCRF
 from nlp_architect import LIBRARY_OUT
 from nlp_architect.utils.generic import pad_sentences
-from nlp_architect.utils.io import download_unlicensed_file
+from nlp_architect.utils.io import download_unlicensed_file, load_vocabs
 from nlp_architect.utils.text import SpacyInstance, bio_to_spans
 
 
@@ -86,8 +85,7 @@ class NerApi(AbstractApi):
     def load_model(self):
         self.model = NERCRF()
         self.model.load(self.pretrained_model)
-        with open(self.pretrained_model_info, "rb") as fp:
-            model_info = pickle.load(fp)
+        model_info = load_vocabs(self.pretrained_model_info)
         self.word_vocab = model_info["word_vocab"]
         self.y_vocab = {v: k for k, v in model_info["y_vocab"].items()}
         self.char_vocab = model_info["char_vocab"]
@@ -43,9 +43,18 @@ class ConllCallback(tf.keras.callbacks.Callback):
         self.y = y
         self.y_vocab = {v: k for k, v in y_vocab.items()}
         self.bsz = batch_size
+        self.label_model = None
+
+    def on_train_begin(self, logs=None):
+        # take the argmax of the (last) model output on the device, so that only the label ids
+        # are copied back to the host instead of the full per-label scores tensor
+        label_ids = tf.keras.layers.Lambda(
+            lambda scores: tf.argmax(scores, axis=-1, output_type=tf.int32)
+        )(self.model.outputs[-1])
+        self.label_model = tf.keras.Model(self.model.inputs, label_ids)
 
     def on_epoch_end(self, epoch, logs=None):
-        predictions = self.model.predict(self.x, batch_size=self.bsz)
+        predictions = self.label_model.predict(self.x, batch_size=self.bsz)
         stats = get_conll_scores(predictions, self.y, self.y_vocab)
         print()
         print("Conll eval: \n{}".format(stats))
@@ -18,6 +18,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import logging
 import os
 import sys
+import tempfile
+from collections.abc import Mapping
 from typing import List
 
 import numpy as np
@@ -29,18 +31,22 @@ from nlp_architect.utils.text import Vocabulary
 logger = logging.getLogger(__name__)
 
 
-def load_word_embeddings(file_path, vocab=None):
+def load_word_embeddings(file_path, vocab=None, mmap=False):
     """
     Loads a word embedding model text file into a word(str) to numpy vector dictionary
 
     Args:
         file_path (str): path to model file
         vocab (list of str): optional - vocabulary
+        mmap (bool): optional - memory-map the vectors instead of loading them
+            (see `load_word_embeddings_mmap`)
 
     Returns:
         list: a dictionary of numpy.ndarray vectors
         int: detected word embedding vector size
     """
+    if mmap:
+        return load_word_embeddings_mmap(file_path, vocab)
     with open(file_path, encoding="utf-8") as fp:
         word_vectors = {}
         size = None
@@ -57,6 +63,153 @@ def load_word_embeddings(file_path, vocab=None):
     return word_vectors, size
 
 
+class MmapWordEmbeddings(Mapping):
+    """
+    Read-only word(str) to vector mapping backed by a (memory-mapped) numpy matrix.
+    Only the word index is held in memory, vectors are read on access.
+
+    Args:
+        words (list of str): words in matrix row order
+        vectors (numpy.ndarray): matrix of word vectors
+        vocab (list of str): optional - vocabulary to restrict the mapping to
+    """
+
+    def __init__(self, words, vectors, vocab=None):
+        self.vectors = vectors
+        self._index = {}
+        for row, word in enumerate(words):
+            if vocab is None or word == " " or word in vocab:
+                self._index[word] = row
+
+    def __getitem__(self, word):
+        return self.vectors[self._index[word]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+
+def _iter_embedding_lines(file_path):
+    with open(file_path, encoding="utf-8") as fp:
+        for line in fp:
+            line_fields = line.split()
+            if len(line_fields) < 5:
+                continue
+            if line[0] == " ":
+                yield " ", line_fields
+            else:
+                yield line_fields[0], line_fields[1:]
+
+
+def _make_temp_path(target_path):
+    # unique temp file in the target's directory, so concurrent writers don't collide and
+    # os.replace stays an atomic rename
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(target_path) + ".", suffix=".tmp", dir=os.path.dirname(target_path)
+    )
+    os.close(fd)
+    return tmp_path
+
+
+def _source_id(file_path):
+    # identifies the exact text file a cache was built from, older mtimes included
+    st = os.stat(file_path)
+    return "{} {}".format(st.st_size, st.st_mtime_ns)
+
+
+def _read_cached_words(words_path, source_id):
+    # the first line of the words file holds the source id of the cached text file
+    try:
+        with open(words_path, "rb") as fp:
+            header, _, words = fp.read().decode("utf-8").partition("\n")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if header != source_id:
+        return None
+    return words.split("\n")
+
+
+def _convert_word_embeddings(file_path, vectors_path, words_path, source_id):
+    # first pass sizes the matrix so it can be filled on disk without holding it in memory
+    size = None
+    n_rows = 0
+    for _, fields in _iter_embedding_lines(file_path):
+        if size is None:
+            size = len(fields)
+        if len(fields) == size:
+            n_rows += 1
+    if size is None:
+        return None
+    logger.info("Converting {} word vectors of {} to {}".format(n_rows, file_path, vectors_path))
+    tmp_paths = []
+    try:
+        tmp_vectors_path = _make_temp_path(vectors_path)
+        tmp_paths.append(tmp_vectors_path)
+        vectors = np.lib.format.open_memmap(
+            tmp_vectors_path, mode="w+", dtype=np.float32, shape=(n_rows, size)
+        )
+        words = []
+        for word, fields in _iter_embedding_lines(file_path):
+            if len(fields) == size:
+                vectors[len(words)] = np.asarray(fields, dtype=np.float32)
+                words.append(word)
+        vectors.flush()
+        del vectors
+        tmp_words_path = _make_temp_path(words_path)
+        tmp_paths.append(tmp_words_path)
+        with open(tmp_words_path, "wb") as fp:
+            fp.write("\n".join([source_id] + words).encode("utf-8"))
+        os.replace(tmp_vectors_path, vectors_path)
+        os.replace(tmp_words_path, words_path)
+    finally:
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return words
+
+
+def load_word_embeddings_mmap(file_path, vocab=None):
+    """
+    Loads a word embedding model text file into a memory-mapped word(str) to numpy vector
+    mapping. On first use (or when the text file's size or mtime changes) the vectors are
+    converted into a binary copy stored next to the text file (<file_path>.vectors.npy and
+    <file_path>.words) that later calls map without parsing. If the copy can't be written
+    (e.g. a read-only directory) the vectors are loaded into memory as in
+    `load_word_embeddings`.
+
+    Args:
+        file_path (str): path to model file
+        vocab (list of str): optional - vocabulary
+
+    Returns:
+        MmapWordEmbeddings: a mapping of words to numpy.ndarray vectors
+        int: detected word embedding vector size
+    """
+    file_path = str(file_path)
+    vectors_path = file_path + ".vectors.npy"
+    words_path = file_path + ".words"
+    source_id = _source_id(file_path)
+    words = _read_cached_words(words_path, source_id)
+    vectors = None
+    if words is not None and os.path.exists(vectors_path):
+        vectors = np.load(vectors_path, mmap_mode="r")
+    if vectors is None or vectors.shape[0] != len(words):
+        try:
+            words = _convert_word_embeddings(file_path, vectors_path, words_path, source_id)
+        except OSError as e:
+            logger.warning(
+                "Unable to cache memory-mapped vectors of {} ({}), loading them into "
+                "memory".format(file_path, e)
+            )
+            return load_word_embeddings(file_path, vocab)
+        if words is None:
+            return {}, None
+        vectors = np.load(vectors_path, mmap_mode="r")
+    return MmapWordEmbeddings(words, vectors, vocab), vectors.shape[1]
+
+
 def fill_embedding_mat(src_mat, src_lex, emb_lex, emb_size):
     """
     Creates a new matrix from given matrix of int words using the embedding
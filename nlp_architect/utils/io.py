@@ -14,25 +14,61 @@
 # limitations under the License.
 # ******************************************************************************
 import argparse
+import functools
 import gzip
 import io
 import json
 import os
+import pickle
 import posixpath
 import re
+import shutil
+import stat
 import sys
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from os import PathLike, makedirs, remove
 from pathlib import Path
 from urllib.parse import urlparse
 
+import numpy as np
 import requests
 from tqdm import tqdm
 
 from nlp_architect.utils.generic import license_prompt
 
+DOWNLOAD_BUFFER_SIZE = 8 * 1024 ** 2
+UNZIP_MAX_WORKERS = 8
+_URL_SCHEMES = frozenset(("http", "https", "ftp", "ftps"))
+RESUME_VALIDATOR_SUFFIX = ".validator"
 
-def download_unlicensed_file(url, sourcefile, destfile, totalsz=None):
+
+def _join_url(url, sourcefile):
+    # unlike posixpath.join, a sourcefile starting with '/' doesn't discard the base url
+    sourcefile = str(sourcefile)
+    parsed = urlparse(sourcefile)
+    if parsed.scheme in _URL_SCHEMES and parsed.netloc:
+        return sourcefile
+    return "{}/{}".format(url.rstrip("/"), sourcefile.lstrip("/"))
+
+
+def _response_validator(req):
+    # If-Range only accepts a strong entity tag or the server's own Last-Modified date
+    etag = req.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return req.headers.get("Last-Modified")
+
+
+def _read_resume_validator(validator_path):
+    try:
+        with open(validator_path, encoding="utf-8") as fp:
+            return fp.read().strip() or None
+    except OSError:
+        return None
+
+
+def download_unlicensed_file(url, sourcefile, destfile, totalsz=None, resume=True):
     """
     Download the file specified by the given URL.
 
@@ -41,27 +77,94 @@ def download_unlicensed_file(url, sourcefile, destfile, totalsz=None):
         sourcefile (str): file to download from url
         destfile (str): save path
         totalsz (:obj:`int`, optional): total size of file
+        resume (bool, optional): continue an interrupted download of destfile using an
+            HTTP Range request (if the server supports it) instead of starting over
     """
-    req = requests.get(posixpath.join(url, sourcefile), stream=True)
-
-    chunksz = 1024 ** 2
-    if totalsz is None:
-        if "Content-length" in req.headers:
-            totalsz = int(req.headers["Content-length"])
-            nchunks = totalsz // chunksz
-        else:
-            print("Unable to determine total file size.")
-            nchunks = None
-    else:
-        nchunks = totalsz // chunksz
-
-    print("Downloading file to: {}".format(destfile))
-    with open(destfile, "wb") as f:
-        for data in tqdm(req.iter_content(chunksz), total=nchunks, unit="MB", file=sys.stdout):
-            f.write(data)
+    file_url = _join_url(url, sourcefile)
+    # while a download is incomplete, the server's ETag/Last-Modified of the file is kept
+    # next to it, so a resumed request can ask for the rest of that exact version only
+    validator_path = str(destfile) + RESUME_VALIDATOR_SUFFIX
+    validator = _read_resume_validator(validator_path) if resume else None
+    offset = os.path.getsize(destfile) if validator and os.path.isfile(destfile) else 0
+    req = None
+    if offset:
+        headers = {
+            "Range": "bytes={}-".format(offset),
+            # the server sends the whole file instead if it no longer matches the validator
+            "If-Range": validator,
+            # ranges refer to the stored representation, so don't let the server re-encode it
+            "Accept-Encoding": "identity",
+        }
+        req = requests.get(file_url, headers=headers, stream=True)
+        content_range = req.headers.get("Content-Range", "")
+        if req.status_code == 416 and content_range == "bytes */{}".format(offset):
+            req.close()
+            remove(validator_path)
+            print("{} is already downloaded".format(destfile))
+            return
+        if req.status_code != 206 or not content_range.startswith("bytes {}-".format(offset)):
+            req.close()
+            print("Unable to resume download of {}, restarting.".format(destfile))
+            req = None
+            offset = 0
+    if req is None:
+        req = requests.get(file_url, stream=True)
+    try:
+        # never write an error page to destfile
+        req.raise_for_status()
+        if not offset:
+            validator = _response_validator(req)
+            if validator:
+                with open(validator_path, "w", encoding="utf-8") as fp:
+                    fp.write(validator)
+            elif os.path.exists(validator_path):
+                remove(validator_path)
+        # let urllib3 undo any transfer content-encoding (gzip, deflate) while copying
+        req.raw.decode_content = True
+
+        if totalsz is None:
+            if "Content-length" in req.headers:
+                totalsz = offset + int(req.headers["Content-length"])
+            else:
+                print("Unable to determine total file size.")
+
+        print("Downloading file to: {}".format(destfile))
+        # reuse a single buffer for the whole transfer instead of allocating bytes per chunk
+        buf = memoryview(bytearray(DOWNLOAD_BUFFER_SIZE))
+        with open(destfile, "ab" if offset else "wb") as f, tqdm(
+            total=totalsz,
+            initial=offset,
+            unit="B",
+            unit_scale=True,
+            mininterval=0.5,
+            file=sys.stdout,
+        ) as progress:
+            while True:
+                n_bytes = req.raw.readinto(buf)
+                if not n_bytes:
+                    break
+                f.write(buf[:n_bytes])
+                progress.update(n_bytes)
+    finally:
+        req.close()
+    if os.path.exists(validator_path):
+        remove(validator_path)
     print("Download Complete")
 
 
+def _extract_zip_members(filepath, members, outpath):
+    # ZipFile handles are not safe to share between threads, each worker opens its own
+    with zipfile.ZipFile(filepath) as z:
+        for member in members:
+            z.extract(member, outpath)
+
+
+def _zip_member_dir(outpath, member):
+    # mirror zipfile's sanitization of archive paths for the member's parent directory
+    parts = [p for p in posixpath.dirname(member.filename).split("/") if p not in ("", ".", "..")]
+    return os.path.join(outpath, *parts)
+
+
 def uncompress_file(filepath: str or os.PathLike, outpath="."):
     """
     Unzip a file to the same location of filepath
@@ -75,16 +178,30 @@ def uncompress_file(filepath: str or os.PathLike, outpath="."):
     if filepath.endswith(".gz"):
         if os.path.isdir(outpath):
             raise ValueError("output path for gzip must be a file")
-        with gzip.open(filepath, "rb") as fp:
-            file_content = fp.read()
-        with open(outpath, "wb") as fp:
-            fp.write(file_content)
+        with gzip.open(filepath, "rb") as fp, open(outpath, "wb") as out_fp:
+            shutil.copyfileobj(fp, out_fp, length=DOWNLOAD_BUFFER_SIZE)
         return None
     # To unzip zipped model files having SHA-encoded etag and url as filename
     # raise ValueError('Unsupported archive provided. Method supports only .zip/.gz files.')
     with zipfile.ZipFile(filepath) as z:
-        z.extractall(outpath)
-        return [x for x in z.namelist() if not (x.startswith("__MACOSX") or x.endswith("/"))]
+        members = z.infolist()
+        names = z.namelist()
+    files = [m for m in members if not m.is_dir()]
+    n_workers = min(UNZIP_MAX_WORKERS, os.cpu_count() or 1, len(files))
+    if n_workers > 1:
+        # create the directory tree up front so workers don't race on makedirs
+        for d in {_zip_member_dir(str(outpath), m) for m in members}:
+            os.makedirs(d, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(_extract_zip_members, filepath, files[i::n_workers], outpath)
+                for i in range(n_workers)
+            ]
+            for future in futures:
+                future.result()
+    else:
+        _extract_zip_members(filepath, members, outpath)
+    return [x for x in names if not (x.startswith("__MACOSX") or x.endswith("/"))]
 
 
 def zipfile_list(filepath: str or os.PathLike):
@@ -129,17 +246,35 @@ def check_directory_and_create(dir_path):
         os.makedirs(dir_path)
 
 
+def _scan_files(directory):
+    # top-down like os.walk: files of a directory first, then its sub-directories,
+    # without following directory symlinks, and skipping directories that can't be listed
+    sub_dirs = []
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append(entry.path)
+            elif not entry.name.startswith(".") and entry.is_file():
+                yield entry
+    for sub_dir in sub_dirs:
+        yield from _scan_files(sub_dir)
+
+
 def walk_directory(directory, verbose=False):
     """Iterates a directory's text files and their contents."""
-    for dir_path, _, filenames in os.walk(directory):
-        for filename in filenames:
-            file_path = os.path.join(dir_path, filename)
-            if os.path.isfile(file_path) and not filename.startswith("."):
-                with io.open(file_path, "r", encoding="utf-8") as file:
-                    if verbose:
-                        print("Reading {}".format(filename))
-                    doc_text = file.read()
-                    yield filename, doc_text
+    for entry in _scan_files(directory):
+        if verbose:
+            print("Reading {}".format(entry.name))
+        with open(entry.path, "rb") as file:
+            doc_text = file.read().decode("utf-8")
+        # keep the universal newlines translation of text mode reading
+        if "\r" in doc_text:
+            doc_text = doc_text.replace("\r\n", "\n").replace("\r", "\n")
+        yield entry.name, doc_text
 
 
 def validate(*args):
@@ -158,9 +293,10 @@ def validate(*args):
     """
     for arg in args:
         arg_val = arg[0]
-        arg_type = (arg[1],) if isinstance(arg[1], type) else arg[1]
+        arg_type = arg[1]
         if not isinstance(arg_val, arg_type):
-            raise TypeError("Expected type {}".format(" or ".join([t.__name__ for t in arg_type])))
+            arg_types = (arg_type,) if isinstance(arg_type, type) else arg_type
+            raise TypeError("Expected type {}".format(" or ".join([t.__name__ for t in arg_types])))
         if arg_val is not None and len(arg) >= 4:
             name = "of " + arg[4] if len(arg) == 5 else ""
             arg_min = arg[2]
@@ -177,10 +313,19 @@ def validate(*args):
                 raise ValueError("{} {} must be less than {}".format(val, name, arg_max))
 
 
+def _path_mode(arg):
+    """Returns the st_mode of an existing path, or None if it can't be stat'ed."""
+    try:
+        return os.stat(arg).st_mode
+    except (OSError, ValueError):
+        return None
+
+
 def validate_existing_filepath(arg):
     """Validates an input argument is a path string to an existing file."""
     validate((arg, str, 0, 255))
-    if not os.path.isfile(arg):
+    mode = _path_mode(arg)
+    if mode is None or not stat.S_ISREG(mode):
         raise ValueError("{0} does not exist.".format(arg))
     return arg
 
@@ -189,7 +334,8 @@ def validate_existing_directory(arg):
     """Validates an input argument is a path string to an existing directory."""
     arg = os.path.abspath(arg)
     validate((arg, str, 0, 255))
-    if not os.path.isdir(arg):
+    mode = _path_mode(arg)
+    if mode is None or not stat.S_ISDIR(mode):
         raise ValueError("{0} does not exist".format(arg))
     return arg
 
@@ -206,10 +352,8 @@ def validate_existing_path(arg):
 def validate_parent_exists(arg):
     """Validates an input argument is a path string, and its parent directory exists."""
     arg = os.path.abspath(arg)
-    dir_arg = os.path.dirname(os.path.abspath(arg))
-    if validate_existing_directory(dir_arg):
-        return arg
-    return None
+    validate_existing_directory(os.path.dirname(arg))
+    return arg
 
 
 def valid_path_append(path, *args):
@@ -244,41 +388,60 @@ def valid_path_append(path, *args):
 
 
 def sanitize_path(path):
+    # normalizing under a '/' anchor keeps leading '..' components from escaping upwards
     s_path = os.path.normpath("/" + path).lstrip("/")
-    assert len(s_path) < 255
+    if len(s_path) >= 255:
+        raise ValueError("Length of path must be less than 255")
     return s_path
 
 
-def check(validator):
-    class CustomAction(argparse.Action):
-        def __call__(self, parser, namespace, values, option_string=None):
-            validator(values)
-            setattr(namespace, self.dest, values)
+class _CheckAction(argparse.Action):
+    """Stores an argument after running a validator function on it."""
+
+    def __init__(self, option_strings, dest, validator=None, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.validator = validator
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        self.validator(values)
+        setattr(namespace, self.dest, values)
 
-    return CustomAction
+
+class _CheckSizeAction(argparse.Action):
+    """Stores an argument after validating its type and value (or length) range."""
+
+    def __init__(self, option_strings, dest, min_size=None, max_size=None, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        validate((values, self.type, self.min_size, self.max_size, self.dest))
+        setattr(namespace, self.dest, values)
+
+
+def check(validator):
+    return functools.partial(_CheckAction, validator=validator)
 
 
 def check_size(min_size=None, max_size=None):
-    class CustomAction(argparse.Action):
-        def __call__(self, parser, namespace, values, option_string=None):
-            validate((values, self.type, min_size, max_size, self.dest))
-            setattr(namespace, self.dest, values)
+    return functools.partial(_CheckSizeAction, min_size=min_size, max_size=max_size)
 
-    return CustomAction
+
+_PROXY_VALIDATION_REGEX = re.compile(
+    r"^(?:http|ftp)s?://"  # http:// or https://
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
+    r"localhost|"  # localhost...
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
 
 
 def validate_proxy_path(arg):
     """Validates an input argument is a valid proxy path or None"""
-    proxy_validation_regex = re.compile(
-        r"^(?:http|ftp)s?://"  # http:// or https://
-        r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
-        r"localhost|"  # localhost...
-        r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
-        r"(?::\d+)?"  # optional port
-        r"(?:/?|[/?]\S+)$",
-        re.IGNORECASE,
-    )
-    if arg is not None and re.match(proxy_validation_regex, arg) is None:
+    if arg is not None and _PROXY_VALIDATION_REGEX.match(arg) is None:
         raise ValueError("{0} is not a valid proxy path".format(arg))
     return arg
 
@@ -290,6 +453,53 @@ def validate_boolean(arg):
     return arg.lower() == "true"
 
 
+def save_vocabs(file_path, vocabs):
+    """
+    Save str-to-id vocabularies as arrays in a compressed numpy archive. The tokens of each
+    vocabulary are stored as one joined UTF-8 string with token offsets, next to an int32
+    array of their ids.
+
+    Args:
+        file_path (str): path of the file to write
+        vocabs (dict): vocabulary name to a dict mapping tokens (str) to ids (int)
+    """
+    arrays = {}
+    for name, vocab in vocabs.items():
+        keys = list(vocab.keys())
+        arrays[name + "_keys"] = np.frombuffer("".join(keys).encode("utf-8"), dtype=np.uint8)
+        arrays[name + "_offsets"] = np.cumsum([0] + [len(k) for k in keys], dtype=np.int64)
+        arrays[name + "_ids"] = np.fromiter(vocab.values(), dtype=np.int32, count=len(vocab))
+    # writing to a file object keeps np.savez from appending a .npz suffix
+    with open(file_path, "wb") as fp:
+        np.savez_compressed(fp, **arrays)
+
+
+def load_vocabs(file_path):
+    """
+    Load vocabularies saved by `save_vocabs`, or a pickled dict of vocabularies
+    as saved by previous versions
+
+    Args:
+        file_path (str): path of the vocabularies file
+
+    Returns:
+        dict: vocabulary name to a dict mapping tokens to ids
+    """
+    if not zipfile.is_zipfile(file_path):
+        with open(file_path, "rb") as fp:
+            return pickle.load(fp)
+    vocabs = {}
+    with np.load(file_path) as data:
+        for key in data.files:
+            if key.endswith("_ids"):
+                name = key[: -len("_ids")]
+                text = data[name + "_keys"].tobytes().decode("utf-8")
+                offsets = data[name + "_offsets"].tolist()
+                keys = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+                vocabs[name] = dict(zip(keys, data[key].tolist()))
+    return vocabs
+
+
 def load_json_file(file_path):
     """load a file into a json object"""
     try:
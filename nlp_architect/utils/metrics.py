@@ -62,19 +62,11 @@ def get_conll_scores(predictions, y, y_lex, unk="O"):
         test_y = test_y.argmax(2)
 
     prediction_data = []
-    for n in range(test_y.shape[0]):
-        test_yval = []
-        for i in list(test_y[n]):
-            try:
-                test_yval.append(y_lex[i])
-            except KeyError:
-                pass
-        test_pval = [unk] * len(test_yval)
-        for e, i in enumerate(list(test_p[n])[: len(test_pval)]):
-            try:
-                test_pval[e] = y_lex[i]
-            except KeyError:
-                pass
+    # convert label ids to python lists once instead of boxing numpy scalars per element
+    for y_ids, p_ids in zip(test_y.tolist(), test_p.tolist()):
+        test_yval = [y_lex[i] for i in y_ids if i in y_lex]
+        test_pval = [y_lex.get(i, unk) for i in p_ids[: len(test_yval)]]
+        test_pval.extend([unk] * (len(test_yval) - len(test_pval)))
         prediction_data.append((test_yval, test_pval))
     y_true, y_pred = list(zip(*prediction_data))
     return classification_report(y_true, y_pred, digits=3)
@@ -14,9 +14,12 @@
 # limitations under the License.
 # ******************************************************************************
 
+import os
+from unittest import mock
+
 import numpy as np
 
-from nlp_architect.utils.embedding import FasttextEmbeddingsModel
+from nlp_architect.utils.embedding import FasttextEmbeddingsModel, load_word_embeddings
 from nlp_architect.utils.testing import NLPArchitectTestCase
 
 texts = [
@@ -49,3 +52,48 @@ class TestFasttextEmbeddingModel(NLPArchitectTestCase):
         new_model = FasttextEmbeddingsModel.load(self.file_path)
         assert new_model is not None
         assert isinstance(new_model["word"], np.ndarray)
+
+
+class TestLoadWordEmbeddings(NLPArchitectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.file_path = str(self.TEST_DIR / "embeddings.txt")
+        with open(self.file_path, "w", encoding="utf-8") as fp:
+            for i, word in enumerate(texts[0].split()):
+                fp.write("{} {}\n".format(word, " ".join(str(i + j / 10) for j in range(5))))
+
+    def test_mmap_matches_full_load(self):
+        vectors, size = load_word_embeddings(self.file_path)
+        mmap_vectors, mmap_size = load_word_embeddings(self.file_path, mmap=True)
+        assert size == mmap_size == 5
+        assert sorted(vectors) == sorted(mmap_vectors)
+        for word, vec in vectors.items():
+            assert np.array_equal(vec, mmap_vectors[word])
+
+    def test_mmap_vocab(self):
+        mmap_vectors, _ = load_word_embeddings(self.file_path, vocab=["fox", "NLP"], mmap=True)
+        assert list(mmap_vectors) == ["fox"]
+
+    def test_mmap_empty_file(self):
+        empty_path = str(self.TEST_DIR / "empty.txt")
+        open(empty_path, "w").close()
+        assert load_word_embeddings(empty_path, mmap=True) == load_word_embeddings(empty_path)
+
+    def test_mmap_unwritable_cache_falls_back(self):
+        with mock.patch("tempfile.mkstemp", side_effect=PermissionError("read-only")):
+            vectors, size = load_word_embeddings(self.file_path, mmap=True)
+        assert isinstance(vectors, dict) and size == 5
+        assert sorted(os.listdir(str(self.TEST_DIR))) == ["embeddings.txt"]
+
+    def test_mmap_replaced_file_with_older_mtime(self):
+        load_word_embeddings(self.file_path, mmap=True)
+        old_mtime_ns = os.stat(self.file_path).st_mtime_ns
+        with open(self.file_path, "w", encoding="utf-8") as fp:
+            for i, word in enumerate(texts[0].split()):
+                fp.write("{} {}\n".format(word, " ".join(str(9 - i + j / 10) for j in range(5))))
+        # e.g. re-extracted from an archive or copied with cp -p
+        os.utime(self.file_path, ns=(old_mtime_ns - 10 ** 10, old_mtime_ns - 10 ** 10))
+        vectors, _ = load_word_embeddings(self.file_path)
+        mmap_vectors, _ = load_word_embeddings(self.file_path, mmap=True)
+        for word, vec in vectors.items():
+            assert np.array_equal(vec, mmap_vectors[word])
@@ -0,0 +1,341 @@
+# ******************************************************************************
+# Copyright 2017-2019 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ******************************************************************************
+import io
+import os
+import pickle
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+from nlp_architect.utils.io import (
+    RESUME_VALIDATOR_SUFFIX,
+    download_unlicensed_file,
+    load_vocabs,
+    save_vocabs,
+    uncompress_file,
+)
+from nlp_architect.utils.testing import NLPArchitectTestCase
+
+vocabs = {
+    "y_vocab": {"O": 1, "B-PER": 2, "I-PER": 3},
+    "word_vocab": {"the": 2, "naïve": 3, "x": 4, "x\x00": 5, "": 6, "a very long token": 7},
+    "char_vocab": {},
+}
+
+
+class TestVocabsIO(NLPArchitectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.file_path = str(self.TEST_DIR / "model_info.dat")
+
+    def test_save_load(self):
+        save_vocabs(self.file_path, vocabs)
+        assert load_vocabs(self.file_path) == vocabs
+
+    def test_load_pickled_vocabs(self):
+        with open(self.file_path, "wb") as fp:
+            pickle.dump(vocabs, fp)
+        assert load_vocabs(self.file_path) == vocabs
+
+
+def _read_tree(root):
+    tree = {}
+    for dir_path, dir_names, file_names in os.walk(root):
+        for name in dir_names:
+            tree[os.path.relpath(os.path.join(dir_path, name), root)] = None
+        for name in file_names:
+            file_path = os.path.join(dir_path, name)
+            with open(file_path, "rb") as fp:
+                tree[os.path.relpath(file_path, root)] = fp.read()
+    return tree
+
+
+class TestUncompressFile(NLPArchitectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.zip_path = str(self.TEST_DIR / "archive.zip")
+
+    def _write_zip(self, members):
+        with zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED) as z:
+            for name, content in members:
+                z.writestr(name, content)
+
+    def _extract(self, out_dir):
+        with mock.patch(
+            "nlp_architect.utils.io.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as executor, mock.patch("os.cpu_count", return_value=4):
+            names = uncompress_file(self.zip_path, out_dir)
+        return names, executor.called
+
+    def _extractall_tree(self):
+        expected_dir = self.TEST_DIR / "expected"
+        with zipfile.ZipFile(self.zip_path) as z:
+            z.extractall(str(expected_dir))
+        return _read_tree(str(expected_dir))
+
+    def test_parallel_extract_matches_extractall(self):
+        self._write_zip(
+            [("top.txt", b"top"), ("empty_dir/", b""), ("../escaped.txt", b"escaped")]
+            + [("a/b{}/c/f{}.txt".format(i % 3, i), os.urandom(2048)) for i in range(12)]
+            + [("__MACOSX/a/._f0.txt", b"mac")]
+        )
+        out_dir = self.TEST_DIR / "out"  # PathLike outpath
+        names, parallel = self._extract(out_dir)
+        assert parallel
+        assert _read_tree(str(out_dir)) == self._extractall_tree()
+        with zipfile.ZipFile(self.zip_path) as z:
+            expected_names = [
+                x for x in z.namelist() if not (x.startswith("__MACOSX") or x.endswith("/"))
+            ]
+        assert names == expected_names
+
+    def test_single_file_extract(self):
+        self._write_zip([("dir/model.bin", os.urandom(4096))])
+        out_dir = str(self.TEST_DIR / "out")
+        names, parallel = self._extract(out_dir)
+        assert not parallel
+        assert names == ["dir/model.bin"]
+        assert _read_tree(out_dir) == self._extractall_tree()
+
+
+data = os.urandom(3 * 1024 + 7)
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, body=b"", headers=None, raw=None):
+        self.status_code = status_code
+        self.raw = raw if raw is not None else io.BytesIO(body)
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError("{} Error".format(self.status_code))
+
+    def close(self):
+        self.closed = True
+
+
+class InterruptedStream(io.BytesIO):
+    """Drops the connection after `limit` bytes were read"""
+
+    def __init__(self, body, limit):
+        super().__init__(body[:limit])
+
+    def readinto(self, b):
+        n_bytes = super().readinto(b)
+        if not n_bytes:
+            raise ConnectionResetError("connection dropped")
+        return n_bytes
+
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Tue, 13 Oct 2026 10:00:00 GMT"
+
+
+class FakeServer(object):
+    """
+    Serves `data`, answering range requests the way a real server does unless a canned
+    resume response is set: a Range is only honoured when If-Range is absent or exactly
+    matches the current ETag or Last-Modified, otherwise the whole file is sent
+    """
+
+    def __init__(
+        self,
+        resume_response=None,
+        status_code=200,
+        etag=ETAG,
+        last_modified=LAST_MODIFIED,
+        interrupt_at=None,
+    ):
+        self.resume_response = resume_response
+        self.status_code = status_code
+        self.validators = {}
+        if etag is not None:
+            self.validators["ETag"] = etag
+        if last_modified is not None:
+            self.validators["Last-Modified"] = last_modified
+        self.interrupt_at = interrupt_at
+        self.requests = []
+        self.responses = []
+
+    def _range_offset(self, headers):
+        if not headers or "Range" not in headers:
+            return None
+        if_range = headers.get("If-Range")
+        if if_range is not None:
+            etag = self.validators.get("ETag")
+            strong_etag = etag if etag and not etag.startswith("W/") else None
+            if if_range not in (strong_etag, self.validators.get("Last-Modified")):
+                return None
+        return int(headers["Range"][len("bytes=") : -1])
+
+    def get(self, url, headers=None, stream=False):
+        self.requests.append(headers or {})
+        offset = self._range_offset(headers)
+        if offset is not None:
+            if self.resume_response is not None:
+                response = self.resume_response
+            elif offset >= len(data):
+                content_range = "bytes */{}".format(len(data))
+                response = FakeResponse(416, headers={"Content-Range": content_range})
+            else:
+                response = FakeResponse(
+                    206,
+                    data[offset:],
+                    {
+                        "Content-length": str(len(data) - offset),
+                        "Content-Range": "bytes {}-{}/{}".format(offset, len(data) - 1, len(data)),
+                    },
+                )
+        else:
+            raw = None
+            if self.interrupt_at is not None:
+                raw = InterruptedStream(data, self.interrupt_at)
+            response_headers = dict(self.validators, **{"Content-length": str(len(data))})
+            response = FakeResponse(self.status_code, data, response_headers, raw)
+        self.responses.append(response)
+        return response
+
+
+class TestDownloadUnlicensedFile(NLPArchitectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.file_path = str(self.TEST_DIR / "model.bin")
+        self.validator_path = self.file_path + RESUME_VALIDATOR_SUFFIX
+
+    def _download(self, server, **kwargs):
+        with mock.patch("nlp_architect.utils.io.requests.get", server.get):
+            download_unlicensed_file(
+                "http://example.com/models/", "model.bin", self.file_path, **kwargs
+            )
+        assert all(r.closed for r in server.responses)
+
+    def _read(self):
+        with open(self.file_path, "rb") as fp:
+            return fp.read()
+
+    def _write(self, content, validator=ETAG):
+        with open(self.file_path, "wb") as fp:
+            fp.write(content)
+        if validator is not None:
+            with open(self.validator_path, "w") as fp:
+                fp.write(validator)
+
+    def test_download(self):
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert server.requests == [{}]
+        assert not os.path.exists(self.validator_path)
+
+    def test_error_status_not_written(self):
+        server = FakeServer(status_code=404)
+        with self.assertRaises(requests.HTTPError):
+            self._download(server)
+        assert not os.path.exists(self.file_path)
+
+    def test_interrupted_download_resumes(self):
+        with self.assertRaises(ConnectionResetError):
+            self._download(FakeServer(interrupt_at=1000))
+        assert self._read() == data[:1000]
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert server.requests == [
+            {"Range": "bytes=1000-", "If-Range": ETAG, "Accept-Encoding": "identity"}
+        ]
+        assert not os.path.exists(self.validator_path)
+
+    def test_resume_uses_last_modified_without_strong_etag(self):
+        with self.assertRaises(ConnectionResetError):
+            self._download(FakeServer(etag='W/"v1"', interrupt_at=1000))
+        server = FakeServer(etag='W/"v1"')
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 1
+        assert server.requests[0]["If-Range"] == LAST_MODIFIED
+
+    def test_no_validator_not_resumed(self):
+        with self.assertRaises(ConnectionResetError):
+            self._download(FakeServer(etag=None, last_modified=None, interrupt_at=1000))
+        assert not os.path.exists(self.validator_path)
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert server.requests == [{}]
+
+    def test_partial_file_without_validator_restarts(self):
+        self._write(data[:1000], validator=None)
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert server.requests == [{}]
+
+    def test_changed_file_restarts(self):
+        self._write(b"stale partial file", validator='"v0"')
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 2
+        assert server.responses[0].status_code == 200
+
+    def test_resume_partial_content(self):
+        self._write(data[:1000])
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 1
+        assert server.requests[0]["Range"] == "bytes=1000-"
+
+    def test_resume_mismatched_content_range_restarts(self):
+        self._write(data[:1000])
+        content_range = "bytes 0-{}/{}".format(len(data) - 1, len(data))
+        server = FakeServer(FakeResponse(206, data, {"Content-Range": content_range}))
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 2
+
+    def test_resume_already_complete(self):
+        self._write(data)
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 1
+        assert not os.path.exists(self.validator_path)
+
+    def test_resume_416_size_mismatch_restarts(self):
+        self._write(data + b"stale")
+        server = FakeServer()
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 2
+
+    def test_resume_ignored_range_restarts(self):
+        self._write(b"stale partial file")
+        server = FakeServer(FakeResponse(200, data, {"Content-length": str(len(data))}))
+        self._download(server)
+        assert self._read() == data
+        assert len(server.requests) == 2
+
+    def test_no_resume_overwrites(self):
+        self._write(data[:1000])
+        server = FakeServer()
+        self._download(server, resume=False)
+        assert self._read() == data
+        assert server.requests == [{}]